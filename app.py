@@ -1,14 +1,12 @@
 import streamlit as st
 from supabase import create_client
-import pandas as pd
+
+from crge.db import PAGE_SIZE, SUPABASE_KEY, SUPABASE_URL, bootstrap, clear_caches, fetch_more, token_subject, warm_up
+from crge.render import render
 
 # ── Page Title ───────────────────────────────────────────────────────────────
 st.title("CRGE Historical Database Explorer")
 
-# ── Supabase Credentials ─────────────────────────────────────────────────────
-SUPABASE_URL = st.secrets["SUPABASE_URL"]
-SUPABASE_KEY = st.secrets["SUPABASE_KEY"]
-
 # ── Authentication Flow ──────────────────────────────────────────────────────
 if "access_token" not in st.session_state:
     st.subheader("🔐 Sign In")
@@ -20,69 +18,66 @@ if "access_token" not in st.session_state:
             auth_res = client.auth.sign_in_with_password({"email": email, "password": password})
             token = auth_res.session.access_token
             st.session_state["access_token"] = token
+            try:
+                warm_up(token)
+            except Exception:
+                pass  # Best effort only; it must never fail the login.
             st.rerun()
         except Exception as e:
             st.error(f"Login failed: {e}")
     st.stop()
 
-# ── Authenticated Supabase Client ───────────────────────────────────────────
-@st.cache_resource
-def get_supabase(token: str):
-    sb = create_client(SUPABASE_URL, SUPABASE_KEY)
-    sb.postgrest.auth(token)
-    return sb
+# ── UI Filters ───────────────────────────────────────────────────────────────
+def reset_pages():
+    st.session_state["pages_loaded"] = 1
 
-supabase = get_supabase(st.session_state["access_token"])
+def load_more():
+    st.session_state["pages_loaded"] = st.session_state.get("pages_loaded", 1) + 1
 
-# ── Data Helpers ─────────────────────────────────────────────────────────────
-@st.cache_data(ttl=600)
-def load_options(table: str, column: str):
-    resp = supabase.table(table).select(column).execute()
-    rows = resp.data or []
-    values = sorted({row[column] for row in rows if column in row})
-    return ["All"] + values
+# Widget values from the previous run are already in session_state, so the
+# data for the current selection can be fetched together with the options.
+# Normalised so equivalent selections (None vs "All", padded or differently
+# cased search text) share one cache entry.
+filters = (
+    st.session_state.get("country") or "All",
+    st.session_state.get("period") or "All",
+    st.session_state.get("section") or "All",
+    (st.session_state.get("search") or "").strip().lower(),
+)
+token = st.session_state["access_token"]
+user  = token_subject(token)
+opts, entries = bootstrap(user, token, *filters)
 
-@st.cache_data(ttl=600)
-def fetch_entries(table: str, country: str, period: str, section: str, search: str):
-    q = (
-        supabase.table(table)
-                .select("*")
-                .order("section_num")
-                .order("entry_num")
-    )
-    if country != "All":
-        q = q.eq("country", country)
-    if period != "All":
-        q = q.eq("period", period)
-    if section != "All":
-        q = q.eq("section", section)
-    if search:
-        q = q.ilike("entry", f"%{search}%")
-    return q.execute().data or []
+def with_all(values):
+    # get_filter_options returns "All" first; guard against option lists
+    # cached before it did, which would otherwise default to a real value.
+    values = values or []
+    return values if values[:1] == ["All"] else ["All"] + values
 
-# ── UI Filters ───────────────────────────────────────────────────────────────
-country = st.selectbox("Country", load_options("English", "country"))
-period  = st.selectbox("Period",  load_options("English", "period"))
-section = st.selectbox("Section", load_options("English", "section"))
-search  = st.text_input("Search entries…")
+# The widgets only store their values under their keys; the queries above read
+# those keys from session_state, not the return values.
+st.selectbox("Country", with_all(opts.get("country")), key="country", on_change=reset_pages)
+st.selectbox("Period",  with_all(opts.get("period")),  key="period",  on_change=reset_pages)
+st.selectbox("Section", with_all(opts.get("section")), key="section", on_change=reset_pages)
+st.text_input("Search entries…", key="search", on_change=reset_pages)
+st.button("🔄 Refresh", on_click=clear_caches)
 
 # ── Fetch & Render Data ──────────────────────────────────────────────────────
-eng_rows  = fetch_entries("English", country, period, section, search)
-orig_rows = fetch_entries("OriginalLanguage", country, period, section, search)
+eng_rows,  eng_count  = entries["English"]
+orig_rows, orig_count = entries["OriginalLanguage"]
+
+# Only the first page is fetched up front; each "Load more" adds one more
+# PAGE_SIZE window, cached per offset.
+for page in range(1, st.session_state.get("pages_loaded", 1)):
+    more = fetch_more(user, token, *filters, page * PAGE_SIZE, eng_count, orig_count)
+    eng_rows  = eng_rows + more["English"][0]
+    orig_rows = orig_rows + more["OriginalLanguage"][0]
 
-def render(rows, label: str):
-    st.header(label)
-    if not rows:
-        st.write("No entries found.")
-        return
-    df = pd.DataFrame(rows)
-    for sec_val, grp in df.groupby("section", sort=False):
-        st.subheader(f"Section: {sec_val}")
-        for entry in grp.get("entry", []):
-            st.write(entry)
+render(eng_rows,  "English", eng_count)
+render(orig_rows, "原文 (Original Language)", orig_count)
 
-render(eng_rows,  "English")
-render(orig_rows, "原文 (Original Language)")
+if len(eng_rows) < eng_count or len(orig_rows) < orig_count:
+    st.button("Load more", on_click=load_more)
 
 # ── Logout Button ────────────────────────────────────────────────────────────
 if st.button("🔒 Log out"):
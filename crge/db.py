@@ -0,0 +1,142 @@
+import base64
+import json
+import threading
+
+import httpx
+import streamlit as st
+from postgrest import SyncPostgrestClient
+from postgrest.constants import DEFAULT_POSTGREST_CLIENT_HEADERS
+from concurrent.futures import ThreadPoolExecutor
+
+# ── Supabase Credentials ─────────────────────────────────────────────────────
+SUPABASE_URL = st.secrets["SUPABASE_URL"]
+SUPABASE_KEY = st.secrets["SUPABASE_KEY"]
+
+# ── Authenticated PostgREST Client ──────────────────────────────────────────
+@st.cache_resource
+def _shared_transport():
+    # One HTTP/2 keep-alive pool for the whole process. The cached resource
+    # outlives reruns and sessions, so requests reuse warm connections instead
+    # of paying a fresh TCP+TLS handshake per login.
+    return httpx.HTTPTransport(
+        http2=True,
+        limits=httpx.Limits(max_keepalive_connections=20, max_connections=20, keepalive_expiry=30.0),
+    )
+
+@st.cache_resource(max_entries=64, ttl=3600)
+def get_rest_client(token: str):
+    # Each token gets only a thin PostgREST client, so the Authorization header
+    # is never shared between users, while all requests go through the shared
+    # transport above. Bounded because tokens expire and users log in again.
+    rest = SyncPostgrestClient(
+        f"{SUPABASE_URL}/rest/v1",
+        headers={**DEFAULT_POSTGREST_CLIENT_HEADERS, "apikey": SUPABASE_KEY},
+        http_client=httpx.Client(transport=_shared_transport(), timeout=10.0, follow_redirects=True),
+    )
+    rest.auth(token)
+    return rest
+
+def token_subject(token: str) -> str:
+    # The JWT's "sub" claim (the user id). Decoded without verification; it is
+    # only used to key caches per user, PostgREST still verifies the token.
+    payload = token.split(".")[1]
+    claims = json.loads(base64.urlsafe_b64decode(payload + "=" * (-len(payload) % 4)))
+    return claims["sub"]
+
+def warm_up(token: str):
+    # Opens a keep-alive connection in the shared pool in the background while
+    # the app reruns after login, so the first real request can reuse it
+    # instead of paying for the handshake. The client is built here, on the
+    # script thread; only the network call runs in the daemon thread.
+    rest = get_rest_client(token)
+
+    def ping():
+        try:
+            rest.table("English").select("country").limit(1).execute()
+        except Exception:
+            pass  # Best effort only.
+
+    threading.Thread(target=ping, daemon=True).start()
+
+# ── Data Helpers ─────────────────────────────────────────────────────────────
+PAGE_SIZE = 200
+ENTRY_COLUMNS = "section,section_num,entry,entry_num"
+SEARCH_RPC = {"English": "search_english", "OriginalLanguage": "search_original_language"}
+
+def _load_all_options_uncached(rest):
+    # One RPC over the filter_domain materialized view (see supabase/migrations),
+    # covering both tables, instead of a full-column download per dropdown.
+    return rest.rpc("get_filter_options", {}).execute().data or {}
+
+def _fetch_entries_uncached(rest, table: str, country: str, period: str, section: str, search: str, offset: int):
+    if search:
+        # Trigram-indexed RPC; see supabase/migrations.
+        q = rest.rpc(SEARCH_RPC[table], {"q": search}, count="exact").select(ENTRY_COLUMNS)
+    else:
+        q = rest.table(table).select(ENTRY_COLUMNS, count="exact")
+    # Served in index order (see supabase/migrations); callers rely on this
+    # ordering rather than re-sorting in Python.
+    q = q.order("section_num").order("entry_num")
+    if country != "All":
+        q = q.eq("country", country)
+    if period != "All":
+        q = q.eq("period", period)
+    if section != "All":
+        q = q.eq("section", section)
+    resp = q.range(offset, offset + PAGE_SIZE - 1).execute()
+    return resp.data or [], resp.count or 0
+
+def _load_initial_payload(rest):
+    # The unfiltered first page is served by a single RPC.
+    data = rest.rpc("initial_payload", {"lim": PAGE_SIZE}).execute().data or {}
+    entries = {
+        "English": (data.get("english_rows") or [], data.get("english_count") or 0),
+        "OriginalLanguage": (data.get("original_rows") or [], data.get("original_count") or 0),
+    }
+    return data.get("options") or {}, entries
+
+def _submit_entries(pool, rest, country: str, period: str, section: str, search: str, offset: int,
+                    tables=("English", "OriginalLanguage")):
+    # The two tables are independent, so their pages are fetched concurrently.
+    return {
+        table: pool.submit(_fetch_entries_uncached, rest, table, country, period, section, search, offset)
+        for table in tables
+    }
+
+# Results are fetched under one user's token and RLS policies, so the user id
+# is part of every cache key; the token itself (leading underscore) is not
+# hashed, so a refreshed token keeps hitting the same entries. Entries stay in
+# memory only and expire after ten minutes.
+@st.cache_data(ttl=600, max_entries=256, show_spinner=False)
+def bootstrap(user_id: str, _token: str, country: str, period: str, section: str, search: str):
+    # Options plus the first page of both tables. These are independent
+    # queries, so issue them concurrently: a cold page costs one round-trip
+    # instead of three.
+    rest = get_rest_client(_token)
+    if (country, period, section, search) == ("All", "All", "All", ""):
+        return _load_initial_payload(rest)
+    with ThreadPoolExecutor(max_workers=3) as pool:
+        opts = pool.submit(_load_all_options_uncached, rest)
+        entries = _submit_entries(pool, rest, country, period, section, search, 0)
+        return opts.result(), {table: fut.result() for table, fut in entries.items()}
+
+@st.cache_data(ttl=600, max_entries=256, show_spinner=False)
+def fetch_more(user_id: str, _token: str, country: str, period: str, section: str, search: str,
+               offset: int, eng_count: int, orig_count: int):
+    # Later pages for "Load more", cached per offset. With count="exact",
+    # PostgREST answers 416 for a range past the end, so tables that are
+    # already exhausted are skipped instead of queried.
+    counts = {"English": eng_count, "OriginalLanguage": orig_count}
+    entries = {table: ([], count) for table, count in counts.items() if offset >= count}
+    pending = [table for table in counts if table not in entries]
+    if not pending:
+        return entries
+    rest = get_rest_client(_token)
+    with ThreadPoolExecutor(max_workers=len(pending)) as pool:
+        futures = _submit_entries(pool, rest, country, period, section, search, offset, pending)
+        entries.update({table: fut.result() for table, fut in futures.items()})
+    return entries
+
+def clear_caches():
+    bootstrap.clear()
+    fetch_more.clear()
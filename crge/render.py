@@ -0,0 +1,31 @@
+import streamlit as st
+from itertools import groupby
+
+# Sections longer than this are collapsed into an expander. This only hides
+# them visually: Streamlit still sends the full contents to the browser.
+EXPANDER_THRESHOLD = 50
+
+def build_sections(rows):
+    # Each section's entries are joined into one markdown body, so the panel
+    # costs one st.markdown call per section instead of one st.write per entry.
+    # Not cached: hashing the rows would cost about as much as the join itself.
+    # Rows arrive ordered by section_num, so consecutive grouping is enough.
+    sections = []
+    for sec_val, grp in groupby(rows, key=lambda r: r.get("section")):
+        entries = [str(r.get("entry")) for r in grp]
+        sections.append((sec_val, len(entries), "\n\n".join(entries)))
+    return sections
+
+def render(rows, label: str, total: int):
+    st.header(label)
+    if not rows:
+        st.write("No entries found.")
+        return
+    st.caption(f"Showing {len(rows)} of {total}")
+    for sec_val, n_entries, body in build_sections(rows):
+        if n_entries > EXPANDER_THRESHOLD:
+            with st.expander(f"Section: {sec_val} ({n_entries} entries)", expanded=False):
+                st.markdown(body)
+        else:
+            st.subheader(f"Section: {sec_val}")
+            st.markdown(body)
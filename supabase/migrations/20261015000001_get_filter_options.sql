@@ -0,0 +1,14 @@
+-- Distinct dropdown values for every filter column in a single round-trip.
+create or replace function public.get_filter_options()
+returns json
+language sql
+stable
+as $$
+    select json_build_object(
+        'country', (select array_agg(distinct country) filter (where country is not null) from "English"),
+        'period',  (select array_agg(distinct period)  filter (where period  is not null) from "English"),
+        'section', (select array_agg(distinct section) filter (where section is not null) from "English")
+    );
+$$;
+
+grant execute on function public.get_filter_options() to authenticated;
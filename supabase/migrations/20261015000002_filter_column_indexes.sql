@@ -0,0 +1,23 @@
+-- Btree indexes on the filter columns of both tables. They serve the
+-- country/period/section equality filters (and exact counts) behind every
+-- filtered page. Also return each option list from get_filter_options
+-- already sorted.
+create index if not exists english_country_idx on "English" (country);
+create index if not exists english_period_idx  on "English" (period);
+create index if not exists english_section_idx on "English" (section);
+
+create index if not exists originallanguage_country_idx on "OriginalLanguage" (country);
+create index if not exists originallanguage_period_idx  on "OriginalLanguage" (period);
+create index if not exists originallanguage_section_idx on "OriginalLanguage" (section);
+
+create or replace function public.get_filter_options()
+returns json
+language sql
+stable
+as $$
+    select json_build_object(
+        'country', (select array_agg(distinct country order by country) filter (where country is not null) from "English"),
+        'period',  (select array_agg(distinct period  order by period)  filter (where period  is not null) from "English"),
+        'section', (select array_agg(distinct section order by section) filter (where section is not null) from "English")
+    );
+$$;
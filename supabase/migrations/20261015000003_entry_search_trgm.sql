@@ -0,0 +1,29 @@
+-- Trigram indexes so substring search on entry is an index lookup instead
+-- of a sequential scan.
+create extension if not exists pg_trgm;
+
+create index if not exists english_entry_trgm
+    on "English" using gin (entry gin_trgm_ops);
+create index if not exists originallanguage_entry_trgm
+    on "OriginalLanguage" using gin (entry gin_trgm_ops);
+
+-- Thin, inlinable wrappers: PostgREST applies the equality filters, ordering
+-- and range on top, and the planner pushes them into the indexed scan.
+create or replace function public.search_english(q text)
+returns setof "English"
+language sql
+stable
+as $$
+    select * from "English" where entry ilike '%' || q || '%';
+$$;
+
+create or replace function public.search_original_language(q text)
+returns setof "OriginalLanguage"
+language sql
+stable
+as $$
+    select * from "OriginalLanguage" where entry ilike '%' || q || '%';
+$$;
+
+grant execute on function public.search_english(text) to authenticated;
+grant execute on function public.search_original_language(text) to authenticated;
@@ -0,0 +1,37 @@
+-- Filter values drawn from both tables, so the dropdowns match what either
+-- panel can actually return. A materialized view keeps get_filter_options
+-- down to a scan of a few hundred rows instead of both full tables.
+create materialized view if not exists public.filter_domain as
+    select country, period, section from "English"
+    union
+    select country, period, section from "OriginalLanguage";
+
+create unique index if not exists filter_domain_key
+    on public.filter_domain (country, period, section);
+
+-- Materialized views bypass RLS, so every (country, period, section) value
+-- is visible to any signed-in user. That is acceptable here: these are only
+-- the dropdown labels, and the entries themselves stay behind RLS. Supabase's
+-- default privileges also grant new relations to anon, which is revoked.
+revoke all on public.filter_domain from anon;
+grant select on public.filter_domain to authenticated;
+
+create or replace function public.get_filter_options()
+returns json
+language sql
+stable
+as $$
+    select json_build_object(
+        'country', (select array_agg(distinct country order by country) filter (where country is not null) from filter_domain),
+        'period',  (select array_agg(distinct period  order by period)  filter (where period  is not null) from filter_domain),
+        'section', (select array_agg(distinct section order by section) filter (where section is not null) from filter_domain)
+    );
+$$;
+
+create extension if not exists pg_cron;
+
+select cron.schedule(
+    'refresh-filter-domain',
+    '*/10 * * * *',
+    $$refresh materialized view concurrently public.filter_domain$$
+);
@@ -0,0 +1,31 @@
+-- Everything the unfiltered first page needs (dropdown options plus the first
+-- page and total count of each table) in one round-trip.
+create or replace function public.initial_payload(lim int default 200)
+returns json
+language sql
+stable
+as $$
+    select json_build_object(
+        'options', public.get_filter_options(),
+        'english_rows', (
+            select coalesce(json_agg(t), '[]'::json) from (
+                select section, section_num, entry, entry_num
+                from "English"
+                order by section_num, entry_num
+                limit lim
+            ) t
+        ),
+        'english_count', (select count(*) from "English"),
+        'original_rows', (
+            select coalesce(json_agg(t), '[]'::json) from (
+                select section, section_num, entry, entry_num
+                from "OriginalLanguage"
+                order by section_num, entry_num
+                limit lim
+            ) t
+        ),
+        'original_count', (select count(*) from "OriginalLanguage")
+    );
+$$;
+
+grant execute on function public.initial_payload(int) to authenticated;
@@ -0,0 +1,6 @@
+-- Entries are always returned ordered by (section_num, entry_num) and paged
+-- with a range, so let Postgres read them in index order instead of sorting.
+create index if not exists english_section_entry_num_idx
+    on "English" (section_num, entry_num);
+create index if not exists originallanguage_section_entry_num_idx
+    on "OriginalLanguage" (section_num, entry_num);
@@ -0,0 +1,13 @@
+-- Return each dropdown list in its final shape, "All" first, so the client
+-- can hand it straight to the selectbox.
+create or replace function public.get_filter_options()
+returns json
+language sql
+stable
+as $$
+    select json_build_object(
+        'country', array['All'] || coalesce((select array_agg(distinct country order by country) filter (where country is not null) from filter_domain), '{}'),
+        'period',  array['All'] || coalesce((select array_agg(distinct period  order by period)  filter (where period  is not null) from filter_domain), '{}'),
+        'section', array['All'] || coalesce((select array_agg(distinct section order by section) filter (where section is not null) from filter_domain), '{}')
+    );
+$$;